@@ -1,5 +1,8 @@
 """API Key authentication."""
 
+import hashlib
+import hmac
+
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 
@@ -7,6 +10,9 @@ from app.config import get_settings
 
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
+# Resolved once at import; keys never change for the lifetime of the process
+_API_KEY_HASHES = get_settings().api_key_hashes
+
 
 async def verify_api_key(api_key: str = Security(api_key_header)) -> str:
     """Verify the API key from request header.
@@ -20,10 +26,8 @@ async def verify_api_key(api_key: str = Security(api_key_header)) -> str:
     Raises:
         HTTPException: If API key is missing or invalid
     """
-    settings = get_settings()
-    settings.api_keys_list.append('dev-mode')
     # If no API keys configured, allow all requests (development mode)
-    if not settings.api_keys_list:
+    if not _API_KEY_HASHES:
         return "dev-mode"
 
     if not api_key:
@@ -32,7 +36,10 @@ async def verify_api_key(api_key: str = Security(api_key_header)) -> str:
             detail="Missing API key. Provide X-API-Key header.",
         )
 
-    if api_key not in settings.api_keys_list:
+    # Compare fixed-length SHA-256 digests in constant time so the check
+    # doesn't leak key contents through timing differences
+    digest = hashlib.sha256(api_key.encode()).digest()
+    if not any(hmac.compare_digest(digest, stored) for stored in _API_KEY_HASHES):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key.",
@@ -1,6 +1,8 @@
 """Application configuration using Pydantic Settings."""
 
-from functools import lru_cache
+import hashlib
+from functools import cached_property, lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -37,22 +39,40 @@ class Settings(BaseSettings):
     # System prompt for the genetics assistant
     system_prompt: str
 
+    # Response cache policy; invalid values fail at startup
+    cache_policy: Literal["enabled", "read_only", "write_only", "replay", "disabled"] = "enabled"
+    cache_maxsize: int = 256
+
+    # Upstream rate limits: requests and tokens per minute (0 = unlimited)
+    hf_rpm: int = 0
+    hf_tpm: int = 0
+
     # CORS origins (comma-separated)
     cors_origins: str = "*"
 
-    @property
-    def cors_origins_list(self) -> list[str]:
-        """Return CORS origins as a list."""
+    @cached_property
+    def cors_origins_list(self) -> tuple[str, ...]:
+        """Return CORS origins, parsed once per process."""
         if not self.cors_origins or self.cors_origins == "*":
-            return ["*"]
-        return [origin.strip() for origin in self.cors_origins.split(",") if origin.strip()]
+            return ("*",)
+        return tuple(origin.strip() for origin in self.cors_origins.split(",") if origin.strip())
 
-    @property
-    def api_keys_list(self) -> list[str]:
-        """Return API keys as a list."""
+    @cached_property
+    def api_keys_list(self) -> tuple[str, ...]:
+        """Return API keys in configuration order, parsed once per process."""
         if not self.api_keys:
-            return []
-        return [key.strip() for key in self.api_keys.split(",") if key.strip()]
+            return ()
+        return tuple(key.strip() for key in self.api_keys.split(",") if key.strip())
+
+    @cached_property
+    def api_keys_set(self) -> frozenset[str]:
+        """Return API keys as an immutable set for O(1) membership checks."""
+        return frozenset(self.api_keys_list)
+
+    @cached_property
+    def api_key_hashes(self) -> frozenset[bytes]:
+        """Return SHA-256 digests of the API keys for constant-time comparison."""
+        return frozenset(hashlib.sha256(key.encode()).digest() for key in self.api_keys_set)
 
 
 @lru_cache
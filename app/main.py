@@ -1,15 +1,17 @@
 """FastAPI application entry point."""
 
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import HTMLResponse
+from fastapi.responses import ORJSONResponse, Response
 
 from app.config import get_settings
 from app.routes import chat, health
+from app.services.llm_service import get_llm_service
 
 # Configure logging
 logging.basicConfig(
@@ -23,6 +25,29 @@ settings = get_settings()
 # Get first API key for Swagger UI (if available)
 default_api_key = settings.api_keys_list[0] if settings.api_keys_list else ""
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize services on startup, clean up on shutdown."""
+    logger.info("Starting GeneticLLM API")
+    logger.info("Model: %s", settings.model_name)
+    logger.info("API keys configured: %d", len(settings.api_keys_list))
+
+    if not settings.hf_token:
+        logger.warning("HF_TOKEN not set - API calls may fail")
+
+    if not settings.api_keys_list:
+        logger.warning("No API_KEYS configured - running in development mode")
+
+    llm_service = get_llm_service()
+    await llm_service.startup()
+    app.state.llm_service = llm_service
+
+    yield
+
+    logger.info("Shutting down GeneticLLM API")
+    await llm_service.aclose()
+
+
 # Create FastAPI app (disable default docs to use custom)
 app = FastAPI(
     title="GeneticLLM API",
@@ -30,14 +55,14 @@ app = FastAPI(
     version="1.0.0",
     docs_url=None,  # Disable default docs
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 
-@app.get("/docs", include_in_schema=False)
-async def custom_swagger_ui_html():
-    """Custom Swagger UI with pre-filled API key."""
-    return HTMLResponse(
-        content=f"""
+# Swagger UI page rendered once at import; the API key and title never
+# change for the lifetime of the process
+_SWAGGER_HTML: bytes = f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -72,9 +97,13 @@ async def custom_swagger_ui_html():
     </script>
 </body>
 </html>
-        """,
-        media_type="text/html",
-    )
+""".encode()
+
+
+@app.get("/docs", include_in_schema=False)
+async def custom_swagger_ui_html():
+    """Custom Swagger UI with pre-filled API key."""
+    return Response(content=_SWAGGER_HTML, media_type="text/html")
 
 
 def custom_openapi():
@@ -124,26 +153,9 @@ app.add_middleware(
 app.include_router(health.router)
 app.include_router(chat.router)
 
-
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup."""
-    settings = get_settings()
-    logger.info(f"Starting GeneticLLM API")
-    logger.info(f"Model: {settings.model_name}")
-    logger.info(f"API keys configured: {len(settings.api_keys_list)}")
-
-    if not settings.hf_token:
-        logger.warning("HF_TOKEN not set - API calls may fail")
-
-    if not settings.api_keys_list:
-        logger.warning("No API_KEYS configured - running in development mode")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown."""
-    logger.info("Shutting down GeneticLLM API")
+# Build the OpenAPI schema once at import instead of on the first
+# /openapi.json request
+custom_openapi()
 
 
 if __name__ == "__main__":
@@ -13,6 +13,10 @@ class ChatRequest(BaseModel):
     max_tokens: Optional[int] = Field(None, ge=1, le=2048, description="Maximum tokens to generate")
 
     model_config = {
+        # Skip unknown-field bookkeeping and assignment revalidation on the
+        # hot request path
+        "extra": "ignore",
+        "validate_assignment": False,
         "json_schema_extra": {
             "examples": [
                 {
@@ -34,6 +38,8 @@ class ChatResponse(BaseModel):
     model: str = Field(..., description="Model used for generation")
 
     model_config = {
+        "extra": "ignore",
+        "validate_assignment": False,
         "json_schema_extra": {
             "examples": [
                 {
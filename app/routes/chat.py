@@ -1,8 +1,11 @@
 """Chat endpoint for genetics Q&A."""
 
 import logging
+from typing import AsyncIterator
 
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from app.auth import verify_api_key
 from app.config import get_settings
@@ -13,10 +16,15 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1", tags=["Chat"])
 
+# Resolved once at import; settings are read-only for the process lifetime
+settings = get_settings()
+
 
 @router.post(
     "/chat",
     response_model=ChatResponse,
+    response_model_exclude_unset=True,
+    response_model_exclude_none=True,
     responses={
         401: {"model": ErrorResponse, "description": "Invalid or missing API key"},
         500: {"model": ErrorResponse, "description": "Model inference error"},
@@ -38,7 +46,6 @@ async def chat(
     Returns:
         ChatResponse with the model's response
     """
-    settings = get_settings()
     llm_service = get_llm_service()
 
     try:
@@ -61,3 +68,48 @@ async def chat(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e),
         )
+
+
+@router.post(
+    "/chat/stream",
+    responses={
+        401: {"model": ErrorResponse, "description": "Invalid or missing API key"},
+    },
+)
+async def chat_stream(
+    request: ChatRequest,
+    api_key: str = Depends(verify_api_key),
+) -> StreamingResponse:
+    """Chat with the genetics LLM, streaming the response.
+
+    Returns Server-Sent Events: each event carries a JSON payload with a
+    `delta` text chunk and the conversation ID, and the stream ends with
+    `data: [DONE]`. Errors after the stream starts are sent as an
+    `error` event.
+
+    Args:
+        request: Chat request with message and optional parameters
+        api_key: Validated API key from header
+
+    Returns:
+        StreamingResponse emitting text/event-stream
+    """
+    llm_service = get_llm_service()
+    stream, conversation_id = llm_service.generate_stream(
+        message=request.message,
+        conversation_id=request.conversation_id,
+        temperature=request.temperature,
+        max_tokens=request.max_tokens,
+    )
+
+    async def event_stream() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in stream:
+                payload = {"delta": chunk, "conversation_id": conversation_id}
+                yield b"data: " + orjson.dumps(payload) + b"\n\n"
+            yield b"data: [DONE]\n\n"
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            yield b"data: " + orjson.dumps({"error": str(e)}) + b"\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
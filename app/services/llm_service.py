@@ -1,15 +1,24 @@
 """HuggingFace Inference API service."""
 
+import asyncio
+import hashlib
 import logging
-import uuid
-from typing import Optional
+import secrets
+from functools import lru_cache
+from typing import AsyncIterator, Optional
 
 import httpx
+import orjson
 
 from app.config import get_settings
+from app.services.rate_limiter import AsyncTokenBucket
+from app.services.response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+# End-of-sequence tokens stripped from model output
+_END_TOKENS = ("<|im_end|>", "<|endoftext|>", "</s>")
+
 
 class LLMService:
     """Service for interacting with the genetics LLM via HuggingFace Inference API."""
@@ -18,6 +27,15 @@ class LLMService:
         """Initialize the LLM service."""
         self.settings = get_settings()
         self.model = self.settings.model_name
+        # Settings never change after load; bind the per-request values once
+        # so the hot path doesn't dereference the settings object
+        self._system_prompt = self.settings.system_prompt
+        self._default_temperature = self.settings.temperature
+        self._default_max_tokens = self.settings.max_new_tokens
+        # Constant parts of the Qwen2 chat template, built once so each
+        # request only concatenates the user message
+        self._prompt_prefix = f"<|im_start|>system{self._system_prompt}<|im_end|><|im_start|>user"
+        self._prompt_suffix = "<|im_end|><|im_start|>assistant"
         # Use dedicated endpoint if available
         self.use_dedicated_endpoint = bool(self.settings.hf_endpoint_url)
         if self.use_dedicated_endpoint:
@@ -28,6 +46,42 @@ class LLMService:
             "Authorization": f"Bearer {self.settings.hf_token}",
             "Content-Type": "application/json",
         }
+        # Shared HTTP client, created on startup so pooled connections and
+        # TLS sessions are reused across requests
+        self._client: Optional[httpx.AsyncClient] = None
+        # Response cache keyed by SHA-256 of prompt and generation parameters
+        self._cache_policy = self.settings.cache_policy
+        self._response_cache = ResponseCache(maxsize=self.settings.cache_maxsize)
+        # In-flight generations keyed like the cache, so concurrent identical
+        # requests share a single upstream call
+        self._inflight: dict[str, asyncio.Task] = {}
+        # Client-side rate limiting against the upstream RPM/TPM quotas
+        self._bucket = AsyncTokenBucket(
+            requests_per_minute=self.settings.hf_rpm,
+            tokens_per_minute=self.settings.hf_tpm,
+        )
+
+    async def startup(self) -> None:
+        """Create the shared HTTP client."""
+        if self._client is None:
+            # HTTP/2 multiplexes concurrent chats over one TLS session, and
+            # passing the headers here lets httpx build the header block once
+            self._client = httpx.AsyncClient(
+                http2=True,
+                headers=self.headers,
+                timeout=httpx.Timeout(self.settings.request_timeout, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=200,
+                    max_keepalive_connections=50,
+                    keepalive_expiry=60.0,
+                ),
+            )
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def generate_response(
         self,
@@ -51,19 +105,211 @@ class LLMService:
             Exception: If generation fails
         """
         # Use provided values or fall back to settings
-        temp = temperature if temperature is not None else self.settings.temperature
-        max_new = max_tokens if max_tokens is not None else self.settings.max_new_tokens
+        temp = temperature if temperature is not None else self._default_temperature
+        max_new = max_tokens if max_tokens is not None else self._default_max_tokens
 
         # Generate or use existing conversation ID
-        conv_id = conversation_id or str(uuid.uuid4())[:8]
+        conv_id = conversation_id or secrets.token_hex(4)
 
         # Format the prompt
         prompt = self._format_prompt(message)
 
+        cache_key = hashlib.sha256(
+            f"{prompt}|{self.model}|{temp}|{max_new}".encode()
+        ).hexdigest()
+
+        if self._cache_reads_allowed(temp):
+            cached = await self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Cache hit for conversation %s", conv_id)
+                return cached, conv_id
+
+        # Coalesce concurrent identical requests onto one upstream call; each
+        # waiter awaits behind a shield so one cancelled client can't cancel
+        # the generation the others are joined on
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            logger.info("Joining in-flight generation for conversation %s", conv_id)
+            return await asyncio.shield(task), conv_id
+
+        task = asyncio.ensure_future(
+            self._call_model(message, prompt, cache_key, conv_id, temp, max_new)
+        )
+        self._inflight[cache_key] = task
+        # Clean up when the task finishes, not when this waiter returns: if
+        # the first caller is cancelled the task keeps running and must stay
+        # joinable until it completes
+        task.add_done_callback(lambda t: self._finish_inflight(cache_key, t))
+
+        return await asyncio.shield(task), conv_id
+
+    def _finish_inflight(self, cache_key: str, task: asyncio.Task) -> None:
+        """Remove a completed generation from the in-flight map.
+
+        Args:
+            cache_key: Response cache key the task was registered under
+            task: The completed generation task
+        """
+        self._inflight.pop(cache_key, None)
+        # Retrieve the exception of failed tasks so orphaned generations
+        # (every waiter cancelled) don't log "exception was never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    def generate_stream(
+        self,
+        message: str,
+        conversation_id: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+    ) -> tuple[AsyncIterator[str], str]:
+        """Stream a response from the genetics LLM chunk by chunk.
+
+        Args:
+            message: User message
+            conversation_id: Optional conversation ID
+            temperature: Generation temperature (defaults to settings)
+            max_tokens: Max tokens to generate (defaults to settings)
+
+        Returns:
+            Tuple of (async iterator of text chunks, conversation_id)
+        """
+        temp = temperature if temperature is not None else self._default_temperature
+        max_new = max_tokens if max_tokens is not None else self._default_max_tokens
+        conv_id = conversation_id or secrets.token_hex(4)
+        return self._stream_model(message, conv_id, temp, max_new), conv_id
+
+    async def _stream_model(
+        self,
+        message: str,
+        conv_id: str,
+        temp: float,
+        max_new: int,
+    ) -> AsyncIterator[str]:
+        """Stream text chunks from the HuggingFace endpoint.
+
+        Serves cache hits as a single chunk and caches the concatenated
+        result on completion, mirroring generate_response.
+
+        Args:
+            message: User message
+            conv_id: Conversation ID (for logging)
+            temp: Generation temperature
+            max_new: Max tokens to generate
+
+        Yields:
+            Text chunks as the model generates them
+
+        Raises:
+            Exception: If generation fails
+        """
+        prompt = self._format_prompt(message)
+        cache_key = hashlib.sha256(
+            f"{prompt}|{self.model}|{temp}|{max_new}".encode()
+        ).hexdigest()
+
+        if self._cache_reads_allowed(temp):
+            cached = await self._response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Cache hit for conversation %s", conv_id)
+                yield cached
+                return
+
+        logger.info("Streaming response for conversation %s with %s", conv_id, self.model)
+
+        # Same payloads as _call_model, with streaming enabled
+        if self.use_dedicated_endpoint:
+            payload = {
+                "inputs": prompt,
+                "stream": True,
+                "parameters": {
+                    "max_new_tokens": max_new,
+                    "temperature": temp,
+                    "do_sample": True,
+                    "return_full_text": False,
+                    "repetition_penalty": 1.2,
+                },
+            }
+        else:
+            payload = {
+                "model": self.model,
+                "messages": [
+                    {"role": "system", "content": self._system_prompt},
+                    {"role": "user", "content": message},
+                ],
+                "max_tokens": max_new,
+                "temperature": temp,
+                "stream": True,
+            }
+
+        if self._client is None:
+            await self.startup()
+
+        await self._bucket.acquire(len(prompt) // 4 + max_new)
+
+        chunks: list[str] = []
+        async with self._client.stream(
+            "POST",
+            self.api_url,
+            json=payload,
+        ) as response:
+            if response.status_code != 200:
+                body = await response.aread()
+                error_msg = body.decode(errors="replace") or f"HTTP {response.status_code}"
+                logger.error("API error: %s - %s", response.status_code, error_msg)
+                raise Exception(f"HuggingFace API error ({response.status_code}): {error_msg}")
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                event = orjson.loads(data)
+                if self.use_dedicated_endpoint:
+                    # TGI format: {"token": {"text": "..."}, ...}
+                    chunk = event.get("token", {}).get("text") or ""
+                else:
+                    # OpenAI format: {"choices": [{"delta": {"content": "..."}}]}
+                    choices = event.get("choices") or [{}]
+                    chunk = choices[0].get("delta", {}).get("content") or ""
+                if chunk:
+                    chunks.append(chunk)
+                    yield chunk
+
+        response_text = self._clean_response("".join(chunks))
+        if response_text and self._cache_writes_allowed(temp):
+            await self._response_cache.put(cache_key, response_text)
+
+        logger.info("Streamed %d chars for conversation %s", len(response_text), conv_id)
+
+    async def _call_model(
+        self,
+        message: str,
+        prompt: str,
+        cache_key: str,
+        conv_id: str,
+        temp: float,
+        max_new: int,
+    ) -> str:
+        """Call the HuggingFace endpoint and return the cleaned response text.
+
+        Args:
+            message: User message
+            prompt: Formatted prompt string
+            cache_key: Response cache key for this request
+            conv_id: Conversation ID (for logging)
+            temp: Generation temperature
+            max_new: Max tokens to generate
+
+        Returns:
+            Cleaned response text
+
+        Raises:
+            Exception: If generation fails
+        """
         try:
-            logger.info(f"Generating response for conversation {conv_id}")
-            logger.info(f"Using model: {self.model}")
-            logger.info(f"API URL: {self.api_url}")
+            logger.info("Generating response for conversation %s with %s", conv_id, self.model)
 
             # Use different format based on endpoint type
             if self.use_dedicated_endpoint:
@@ -83,36 +329,41 @@ class LLMService:
                 payload = {
                     "model": self.model,
                     "messages": [
-                        {"role": "system", "content": self.settings.system_prompt},
+                        {"role": "system", "content": self._system_prompt},
                         {"role": "user", "content": message},
                     ],
                     "max_tokens": max_new,
                     "temperature": temp,
                 }
 
-            async with httpx.AsyncClient(timeout=self.settings.request_timeout) as client:
-                response = await client.post(
-                    self.api_url,
-                    headers=self.headers,
-                    json=payload,
-                )
+            if self._client is None:
+                await self.startup()
+
+            # Stay under the upstream quotas instead of eating 429s
+            await self._bucket.acquire(len(prompt) // 4 + max_new)
 
-            logger.info(f"Response status: {response.status_code}")
+            response = await self._client.post(
+                self.api_url,
+                json=payload,
+            )
 
-            logger.info(f"Response body: {response.text[:500] if response.text else 'empty'}")
+            logger.info("Response status: %s", response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response body: %s", response.text[:500] if response.text else "empty")
 
             if response.status_code != 200:
                 error_msg = response.text or f"HTTP {response.status_code}"
                 try:
-                    error_data = response.json()
+                    error_data = orjson.loads(response.content)
                     error_msg = error_data.get("error", {}).get("message", error_msg) if isinstance(error_data.get("error"), dict) else error_data.get("error", error_msg)
-                except:
+                except (ValueError, KeyError, TypeError):
                     pass
-                logger.error(f"API error: {response.status_code} - {error_msg}")
+                logger.error("API error: %s - %s", response.status_code, error_msg)
                 raise Exception(f"HuggingFace API error ({response.status_code}): {error_msg}")
 
-            data = response.json()
-            logger.info(f"Response data: {data}")
+            data = orjson.loads(response.content)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response data: %s", data)
 
             # Extract response based on endpoint type
             if self.use_dedicated_endpoint:
@@ -131,16 +382,32 @@ class LLMService:
             if not response_text:
                 raise Exception("Model returned empty response.")
 
-            logger.info(f"Generated {len(response_text)} chars for conversation {conv_id}")
-            return response_text, conv_id
+            if self._cache_writes_allowed(temp):
+                await self._response_cache.put(cache_key, response_text)
+
+            logger.info("Generated %d chars for conversation %s", len(response_text), conv_id)
+            return response_text
 
         except httpx.TimeoutException:
             raise Exception("Request timed out. The model may be loading - please try again.")
-        except Exception as e:
-            import traceback
-            logger.error(f"Generation error: {traceback.format_exc()}")
+        except (httpx.HTTPError, ValueError, KeyError) as e:
+            # Full traceback only at DEBUG; formatting it walks the whole
+            # stack and allocates a large string
+            logger.error(
+                "Generation error: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
             raise Exception(f"Failed to generate response: {str(e)}")
 
+    def _cache_reads_allowed(self, temp: float) -> bool:
+        """Whether a cached response may be served for this temperature."""
+        if self._cache_policy == "replay":
+            return True
+        return self._cache_policy in ("enabled", "read_only") and temp == 0
+
+    def _cache_writes_allowed(self, temp: float) -> bool:
+        """Whether a generated response should be stored for this temperature."""
+        return self._cache_policy in ("enabled", "write_only") and temp == 0
+
     def _format_prompt(self, message: str) -> str:
         """Format the prompt for the model.
 
@@ -151,7 +418,7 @@ class LLMService:
             Formatted prompt string
         """
         # Qwen2 chat format
-        return f"""<|im_start|>system{self.settings.system_prompt}<|im_end|><|im_start|>user{message}<|im_end|><|im_start|>assistant"""
+        return self._prompt_prefix + message + self._prompt_suffix
 
     def _clean_response(self, response: str) -> str:
         """Clean up the model response.
@@ -164,22 +431,13 @@ class LLMService:
         """
         # Remove any trailing special tokens
         response = response.strip()
+        for token in _END_TOKENS:
+            response = response.removesuffix(token)
 
-        # Remove end tokens if present
-        for token in ["<|im_end|>", "<|endoftext|>", "</s>"]:
-            if response.endswith(token):
-                response = response[: -len(token)].strip()
-
-        return response
-
-
-# Singleton instance
-_llm_service: Optional[LLMService] = None
+        return response.strip()
 
 
+@lru_cache(maxsize=1)
 def get_llm_service() -> LLMService:
     """Get the LLM service singleton."""
-    global _llm_service
-    if _llm_service is None:
-        _llm_service = LLMService()
-    return _llm_service
+    return LLMService()
@@ -0,0 +1,71 @@
+"""Client-side rate limiting for the HuggingFace endpoint."""
+
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """Token bucket limiter for requests-per-minute and tokens-per-minute quotas.
+
+    Maintains two continuously refilled buckets, one counting requests and
+    one counting generation tokens. ``acquire`` sleeps just long enough for
+    both buckets to cover the pending request, smoothing bursts so the
+    upstream endpoint never returns 429s. A limit of 0 disables that bucket.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0):
+        """Initialize the bucket.
+
+        Args:
+            requests_per_minute: Max requests per minute (0 = unlimited)
+            tokens_per_minute: Max generation tokens per minute (0 = unlimited)
+        """
+        self._rpm = requests_per_minute
+        self._tpm = tokens_per_minute
+        self._request_tokens = float(requests_per_minute)
+        self._token_tokens = float(tokens_per_minute)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        """Block until the request fits within both quotas.
+
+        Args:
+            estimated_tokens: Estimated token cost of the request
+        """
+        if not self._rpm and not self._tpm:
+            return
+
+        # A request estimated above the whole per-minute quota can never be
+        # covered by the bucket; clamp it to capacity so it pays a full
+        # refill interval instead of sleeping forever (and deadlocking every
+        # caller queued behind the lock)
+        if self._tpm:
+            estimated_tokens = min(estimated_tokens, self._tpm)
+
+        async with self._lock:
+            while True:
+                self._refill()
+                wait = 0.0
+                if self._rpm and self._request_tokens < 1:
+                    wait = max(wait, (1 - self._request_tokens) * 60 / self._rpm)
+                if self._tpm and self._token_tokens < estimated_tokens:
+                    wait = max(wait, (estimated_tokens - self._token_tokens) * 60 / self._tpm)
+                if wait == 0.0:
+                    break
+                await asyncio.sleep(wait)
+
+            if self._rpm:
+                self._request_tokens -= 1
+            if self._tpm:
+                self._token_tokens -= estimated_tokens
+
+    def _refill(self) -> None:
+        """Refill both buckets according to elapsed time."""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        if self._rpm:
+            self._request_tokens = min(self._rpm, self._request_tokens + elapsed * self._rpm / 60)
+        if self._tpm:
+            self._token_tokens = min(self._tpm, self._token_tokens + elapsed * self._tpm / 60)
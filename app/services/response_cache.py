@@ -0,0 +1,36 @@
+"""Bounded in-process cache for chat completions."""
+
+import asyncio
+from collections import OrderedDict
+from typing import Optional
+
+
+class ResponseCache:
+    """Async-safe LRU cache mapping prompt hashes to generated responses."""
+
+    def __init__(self, maxsize: int = 256):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries before least-recently-used
+                entries are evicted
+        """
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached response for a key, or None on a miss."""
+        async with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    async def put(self, key: str, value: str) -> None:
+        """Store a response, evicting the oldest entries past maxsize."""
+        async with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)